@@ -15,26 +15,117 @@ import os
 import sys
 import json
 import csv
+import fnmatch
 import logging
+import logging.handlers
 from datetime import datetime
 from pathlib import Path
 import re
-from typing import List, Dict, Optional, Tuple
+from collections import Counter
+from typing import Callable, Iterator, List, Dict, Optional, Pattern, Tuple, Union
 import shutil
+import string
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Librerie esterne per migliorare l'UX
+# Librerie esterne per migliorare l'UX: Rich viene importato solo quando
+# serve davvero (terminale interattivo), qui si verifica soltanto che ci sia
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
+if not RICH_AVAILABLE:
+    print("⚠️  Rich non installato. Installa con: pip install rich")
+
+# Serializzatore JSON veloce (opzionale): senza orjson si usa il modulo json
 try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich.progress import Progress
-    from rich.panel import Panel
-    from rich.text import Text
-    RICH_AVAILABLE = True
+    import orjson
 except ImportError:
-    RICH_AVAILABLE = False
-    print("⚠️  Rich non installato. Installa con: pip install rich")
+    orjson = None
+
+# Pattern precompilato per separare le parole nel camelCase
+_CAMEL_SPLIT_RE = re.compile(r'[_\-\s]+')
+
+# Placeholder supportati da rename_with_pattern
+_PATTERN_FIELDS = ('name', 'ext', 'counter', 'date', 'time', 'size')
+
+# Specifiche di formato ammesse nel pattern compilato (niente graffe annidate)
+_SAFE_FORMAT_SPEC_RE = re.compile(r'[\w<>=^+\- #,.%]*')
+
+# Unità per _format_size, indicizzate per potenze di 1024
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
+def _compile_name_filter(pattern: str) -> Optional[Callable[[str], object]]:
+    """
+    Traduce un pattern glob sul nome file in un filtro precompilato
+    
+    Il pattern viene tradotto in regex una volta sola invece che a ogni
+    chiamata di fnmatch.fnmatch. Come fnmatch, il confronto segue il case
+    del sistema (os.path.normcase).
+    
+    Args:
+        pattern: Pattern di ricerca (es. "*.txt", "image_*")
+        
+    Returns:
+        Funzione che accetta un nome file, oppure None se il pattern è "*"
+        e accetta qualsiasi nome
+    """
+    if pattern == "*":
+        return None
+    
+    match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+    if os.path.normcase("A") == "A":
+        return match
+    
+    normcase = os.path.normcase
+    return lambda name: match(normcase(name))
+
+
+def _to_camel(name: str, _split=_CAMEL_SPLIT_RE.split) -> str:
+    """
+    Converte un nome in camelCase (es. "my file-name" → "myFileName")
+    """
+    words = _split(name)
+    return words[0].lower() + ''.join(word.capitalize() for word in words[1:])
+
+
+# Trasformazioni di case, risolte una volta per batch
+_CASE_TRANSFORMS = {
+    "lower": str.lower,
+    "upper": str.upper,
+    "title": str.title,
+    "camel": _to_camel,
+}
+
+# Logger del modulo
+logger = logging.getLogger(__name__)
+
+# Colonne del log delle operazioni in formato CSV
+OPERATIONS_LOG_FIELDS = ['original', 'new', 'timestamp', 'success', 'error']
 
 # Configurazione del logging
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler con buffer da 64 KiB: i record vengono scritti su disco a
+    blocchi invece che con una write() ciascuno (gli errori forzano il flush)
+    """
+    
+    BUFFER_SIZE = 65536
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.BUFFER_SIZE,
+                    encoding=self.encoding)
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
 def setup_logging(log_level: str = "INFO") -> None:
     """
     Configura il sistema di logging per tracciare tutte le operazioni
@@ -49,17 +140,130 @@ def setup_logging(log_level: str = "INFO") -> None:
     # Nome del file log con timestamp
     log_file = log_dir / f"file_renamer_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
     
+    log_format = '%(asctime)s - %(levelname)s - %(message)s'
+    
+    # Il file viene scritto a blocchi tramite un MemoryHandler e un buffer
+    # ampio, così ogni rinomina non costa una scrittura su disco
+    file_handler = _BufferedFileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter(log_format))
+    memory_handler = logging.handlers.MemoryHandler(capacity=1024, target=file_handler)
+    
+    # Su console solo avvisi ed errori: il progresso lo mostra già Rich
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.WARNING)
+    
     # Configurazione del logger
     logging.basicConfig(
         level=getattr(logging, log_level.upper()),
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()  # Anche su console
-        ]
+        format=log_format,
+        handlers=[memory_handler, console_handler]
     )
 
 
+def _compile_pattern(pattern: str) -> Callable[[Dict[str, str]], str]:
+    """
+    Compila il pattern di rename_with_pattern in una funzione specializzata
+    
+    Il pattern è lo stesso per tutto il batch: viene tradotto una sola volta in
+    una f-string, così il formato non va rianalizzato per ogni file. Il testo
+    dell'utente entra nel codice solo come letterale (repr) e sono ammessi solo
+    i placeholder noti; negli altri casi (indici, attributi, specifiche annidate,
+    pattern non validi) si usa pattern.format_map, che dà gli stessi risultati
+    e gli stessi errori.
+    
+    Args:
+        pattern: Pattern per i nuovi nomi
+        
+    Returns:
+        Funzione che dalla mappa dei placeholder restituisce il nuovo nome
+    """
+    pieces = []
+    fields = []
+    
+    try:
+        parsed = list(string.Formatter().parse(pattern))
+    except ValueError:
+        return pattern.format_map
+    
+    for literal, field_name, format_spec, conversion in parsed:
+        if literal:
+            pieces.append(repr(literal))
+        if field_name is None:
+            continue
+        if (field_name not in _PATTERN_FIELDS
+                or conversion not in (None, 's', 'r', 'a')
+                or not _SAFE_FORMAT_SPEC_RE.fullmatch(format_spec)):
+            return pattern.format_map
+        
+        conversion = f"!{conversion}" if conversion else ""
+        format_spec = f":{format_spec}" if format_spec else ""
+        pieces.append(f"f'{{{field_name}{conversion}{format_spec}}}'")
+        if field_name not in fields:
+            fields.append(field_name)
+    
+    # Ogni placeholder viene letto una volta sola dalla mappa (lazy)
+    source = "def _make_name(placeholders):\n"
+    for field_name in fields:
+        source += f"    {field_name} = placeholders['{field_name}']\n"
+    source += f"    return {' '.join(pieces) or repr('')}\n"
+    
+    namespace = {}
+    try:
+        exec(compile(source, '<pattern>', 'exec'), namespace)
+    except SyntaxError:
+        return pattern.format_map
+    return namespace['_make_name']
+
+
+class LazyPlaceholders(dict):
+    """
+    Valori dei placeholder di rename_with_pattern calcolati al primo utilizzo
+    
+    str.format_map chiama __missing__ solo per le chiavi presenti nel pattern,
+    quindi stat() del file e strftime() vengono eseguiti solo se servono.
+    Data e ora sono condivise tra tutti i file del batch tramite shared.
+    """
+    
+    def __init__(self, file_path: Path, counter: int, renamer: "FileRenamer",
+                 now: datetime, shared: Dict[str, str]):
+        """
+        Inizializza i placeholder per un file
+        
+        Args:
+            file_path: File a cui si riferiscono i placeholder
+            counter: Numero progressivo del file
+            renamer: FileRenamer usato per lo stat e la dimensione
+            now: Istante di riferimento del batch
+            shared: Valori comuni a tutto il batch (date, time)
+        """
+        super().__init__(counter=str(counter).zfill(3))  # Pad con zeri (001, 002, etc.)
+        self._file_path = file_path
+        self._renamer = renamer
+        self._now = now
+        self._shared = shared
+    
+    def __missing__(self, key: str) -> str:
+        """
+        Calcola e memorizza il valore di un placeholder non ancora usato
+        """
+        if key in ('name', 'ext'):
+            # Nome ed estensione con un solo split del nome file
+            self['name'], self['ext'] = os.path.splitext(self._file_path.name)
+            return self[key]
+        elif key == 'size':
+            value = FileRenamer._format_size(self._renamer.get_file_stat(self._file_path).st_size)
+        elif key in ('date', 'time'):
+            value = self._shared.get(key)
+            if value is None:
+                value = self._now.strftime('%Y-%m-%d' if key == 'date' else '%H-%M-%S')
+                self._shared[key] = value
+        else:
+            raise KeyError(key)
+        
+        self[key] = value
+        return value
+
+
 class FileRenamer:
     """
     Classe principale per gestire la rinomina dei file
@@ -68,24 +272,44 @@ class FileRenamer:
     diversi metodi per applicare regole di denominazione ai file.
     """
     
-    def __init__(self, directory: str, dry_run: bool = False):
+    def __init__(self, directory: str, dry_run: bool = False, log_format: Optional[str] = None,
+                 no_rich: bool = False):
         """
         Inizializza il file renamer
         
         Args:
             directory: Directory di lavoro dove cercare i file
             dry_run: Se True, simula le operazioni senza eseguirle
+            log_format: Se indicato (json, csv), il log delle operazioni viene
+                scritto su file durante la rinomina invece che tenuto in memoria
+            no_rich: Se True, usa l'output testuale semplice anche con Rich installato
         """
         self.directory = Path(directory)
         self.dry_run = dry_run
-        self.console = Console() if RICH_AVAILABLE else None
+        self.log_format = log_format
+        
+        # Rich solo su terminale interattivo: con output rediretto (pipe, CI)
+        # tabelle e barre di progresso sono solo lavoro in più
+        use_rich = (RICH_AVAILABLE and not no_rich
+                    and sys.stdout is not None and sys.stdout.isatty())
+        if use_rich:
+            from rich.console import Console
+            self.console = Console()
+        else:
+            self.console = None
         self.operations_log = []  # Tiene traccia delle operazioni
+        self._log_fp = None  # File del log operazioni aperto in scrittura
+        self._log_writer = None  # Writer CSV per il log operazioni
+        self._log_file: Optional[Path] = None
+        self._log_lock = threading.Lock()  # La rinomina usa più thread
+        self._dir_entries: Dict[Path, os.DirEntry] = {}  # Voci trovate in scansione
+        self._stat_cache: Dict[Path, os.stat_result] = {}  # Stat già letti
         
         # Verifica che la directory esista
         if not self.directory.exists():
             raise FileNotFoundError(f"Directory non trovata: {directory}")
         
-        logging.info(f"FileRenamer inizializzato per directory: {directory}")
+        logger.info("FileRenamer inizializzato per directory: %s", directory)
     
     def get_files(self, pattern: str = "*", recursive: bool = False) -> List[Path]:
         """
@@ -98,16 +322,92 @@ class FileRenamer:
         Returns:
             Lista dei file trovati
         """
-        if recursive:
-            files = list(self.directory.rglob(pattern))
+        files = list(self.iter_files(pattern, recursive))
+        
+        logger.info("Trovati %d file con pattern '%s'", len(files), pattern)
+        return files
+    
+    def iter_files(self, pattern: str = "*", recursive: bool = False) -> Iterator[Path]:
+        """
+        Come get_files, ma restituisce i file man mano che vengono trovati
+        
+        Args:
+            pattern: Pattern di ricerca (es. "*.txt", "image_*")
+            recursive: Se True, cerca anche nelle sottodirectory
+            
+        Yields:
+            File che corrispondono al pattern
+        """
+        self._dir_entries = {}
+        self._stat_cache = {}
+        
+        if '/' in pattern or os.sep in pattern:
+            # Pattern con sottocartelle: serve la semantica completa di glob
+            if recursive:
+                files = self.directory.rglob(pattern)
+            else:
+                files = self.directory.glob(pattern)
+            
+            # Filtra solo i file (non le directory)
+            yield from (f for f in files if f.is_file())
         else:
-            files = list(self.directory.glob(pattern))
+            # os.scandir riusa il tipo letto dalla directory per is_file() e
+            # conserva lo stat nella DirEntry, che teniamo per get_file_stat
+            dir_entries = self._dir_entries
+            name_filter = _compile_name_filter(pattern)
+            for entry in self._scan_entries(os.fspath(self.directory), name_filter, recursive):
+                file_path = Path(entry.path)
+                dir_entries[file_path] = entry
+                yield file_path
+    
+    def get_file_stat(self, file_path: Path) -> os.stat_result:
+        """
+        Restituisce lo stat del file, riusando quello letto da get_files
         
-        # Filtra solo i file (non le directory)
-        files = [f for f in files if f.is_file()]
+        Args:
+            file_path: File di cui ottenere lo stat
         
-        logging.info(f"Trovati {len(files)} file con pattern '{pattern}'")
-        return files
+        Returns:
+            Risultato di os.stat per il file
+        """
+        st = self._stat_cache.get(file_path)
+        if st is None:
+            entry = self._dir_entries.get(file_path)
+            st = entry.stat() if entry is not None else file_path.stat()
+            self._stat_cache[file_path] = st
+        return st
+    
+    def _scan_entries(self, directory: str, name_filter: Optional[Callable[[str], object]],
+                      recursive: bool) -> Iterator[os.DirEntry]:
+        """
+        Scorre una directory con os.scandir restituendo i file che corrispondono al pattern
+        
+        Le sottodirectory vengono visitate dopo i file della directory corrente,
+        senza seguire i link simbolici (come fa rglob).
+        
+        Args:
+            directory: Directory da scorrere
+            name_filter: Filtro sul nome del file (da _compile_name_filter),
+                None per accettare tutti i file
+            recursive: Se True, scende anche nelle sottodirectory
+            
+        Returns:
+            Iteratore sulle DirEntry dei file trovati
+        """
+        subdirs = []
+        
+        with os.scandir(directory) as it:
+            for entry in it:
+                if recursive and entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif (name_filter is None or name_filter(entry.name)) and entry.is_file():
+                    yield entry
+        
+        for subdir in subdirs:
+            try:
+                yield from self._scan_entries(subdir, name_filter, recursive)
+            except PermissionError as e:
+                logger.warning("Directory non accessibile: %s", e)
     
     def preview_changes(self, files: List[Path], new_names: List[str]) -> None:
         """
@@ -117,14 +417,16 @@ class FileRenamer:
             files: Lista dei file originali
             new_names: Lista dei nuovi nomi
         """
-        if RICH_AVAILABLE:
+        if self.console is not None:
+            from rich.table import Table
+            
             table = Table(title="Anteprima Modifiche")
             table.add_column("File Originale", style="cyan")
             table.add_column("Nuovo Nome", style="green")
             table.add_column("Dimensione", style="yellow")
             
             for original, new_name in zip(files, new_names):
-                size = self._format_size(original.stat().st_size)
+                size = self._format_size(self.get_file_stat(original).st_size)
                 table.add_row(original.name, new_name, size)
             
             self.console.print(table)
@@ -132,10 +434,11 @@ class FileRenamer:
             print("\n📋 ANTEPRIMA MODIFICHE:")
             print("-" * 60)
             for original, new_name in zip(files, new_names):
-                size = self._format_size(original.stat().st_size)
+                size = self._format_size(self.get_file_stat(original).st_size)
                 print(f"{original.name:<30} → {new_name:<30} ({size})")
     
-    def _format_size(self, size_bytes: int) -> str:
+    @staticmethod
+    def _format_size(size_bytes: int) -> str:
         """
         Formatta la dimensione del file in modo leggibile
         
@@ -145,11 +448,12 @@ class FileRenamer:
         Returns:
             Stringa formattata (es. "1.5 MB")
         """
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} TB"
+        if size_bytes <= 0:
+            return f"{size_bytes:.1f} B"
+        
+        # L'unità si ricava dal numero di bit: ogni 10 bit è un fattore 1024
+        index = min((size_bytes.bit_length() - 1) // 10, 4)
+        return f"{size_bytes / (1 << (index * 10)):.1f} {_SIZE_UNITS[index]}"
     
     def rename_with_pattern(self, files: List[Path], pattern: str) -> List[str]:
         """
@@ -170,31 +474,20 @@ class FileRenamer:
         Returns:
             Lista dei nuovi nomi generati
         """
-        new_names = []
-        
-        for i, file_path in enumerate(files, 1):
-            # Estrae informazioni dal file
-            name_without_ext = file_path.stem
-            extension = file_path.suffix
-            file_size = self._format_size(file_path.stat().st_size)
-            current_date = datetime.now().strftime('%Y-%m-%d')
-            current_time = datetime.now().strftime('%H-%M-%S')
-            
-            # Sostituisce i placeholder nel pattern
-            new_name = pattern.format(
-                name=name_without_ext,
-                ext=extension,
-                counter=str(i).zfill(3),  # Pad con zeri (001, 002, etc.)
-                date=current_date,
-                time=current_time,
-                size=file_size
-            )
-            
-            new_names.append(new_name)
-        
-        return new_names
+        # Data e ora sono le stesse per tutto il batch
+        now = datetime.now()
+        shared = {}
+        make_name = _compile_pattern(pattern)
+        
+        # Sostituisce i placeholder nel pattern: vengono calcolati
+        # solo quelli effettivamente usati
+        return [
+            make_name(LazyPlaceholders(file_path, i, self, now, shared))
+            for i, file_path in enumerate(files, 1)
+        ]
     
-    def rename_sequential(self, files: List[Path], base_name: str, start_num: int = 1) -> List[str]:
+    @staticmethod
+    def rename_sequential(files: List[Path], base_name: str, start_num: int = 1) -> List[str]:
         """
         Rinomina i file in sequenza numerica
         
@@ -206,17 +499,17 @@ class FileRenamer:
         Returns:
             Lista dei nuovi nomi
         """
-        new_names = []
-        
-        for i, file_path in enumerate(files):
-            extension = file_path.suffix
-            number = start_num + i
-            new_name = f"{base_name}_{number:03d}{extension}"
-            new_names.append(new_name)
-        
-        return new_names
+        # Il prefisso è uguale per tutti i file: costruito una volta sola.
+        # La numerazione resta unica sull'intero batch, nell'ordine dei file
+        prefix = f"{base_name}_"
+        splitext = os.path.splitext
+        return [
+            f"{prefix}{number:03d}{splitext(file_path.name)[1]}"
+            for number, file_path in enumerate(files, start_num)
+        ]
     
-    def rename_case_transform(self, files: List[Path], transform: str) -> List[str]:
+    @staticmethod
+    def rename_case_transform(files: List[Path], transform: str) -> List[str]:
         """
         Trasforma il case dei nomi file
         
@@ -227,54 +520,45 @@ class FileRenamer:
         Returns:
             Lista dei nuovi nomi
         """
-        new_names = []
+        # La trasformazione è la stessa per tutti i file: la sceglie una volta sola
+        transform_name = _CASE_TRANSFORMS.get(transform, str)
         
-        for file_path in files:
-            name_without_ext = file_path.stem
-            extension = file_path.suffix
-            
-            if transform == "lower":
-                new_name = name_without_ext.lower()
-            elif transform == "upper":
-                new_name = name_without_ext.upper()
-            elif transform == "title":
-                new_name = name_without_ext.title()
-            elif transform == "camel":
-                # Converte in camelCase
-                words = re.split(r'[_\-\s]+', name_without_ext)
-                new_name = words[0].lower() + ''.join(word.capitalize() for word in words[1:])
-            else:
-                new_name = name_without_ext
-            
-            new_names.append(new_name + extension)
-        
-        return new_names
+        splitext = os.path.splitext
+        return [
+            transform_name(name_without_ext) + extension
+            for name_without_ext, extension in (splitext(file_path.name) for file_path in files)
+        ]
     
-    def apply_regex_replacement(self, files: List[Path], pattern: str, replacement: str) -> List[str]:
+    @staticmethod
+    def apply_regex_replacement(files: List[Path], pattern: Union[str, Pattern],
+                                replacement: str) -> List[str]:
         """
         Applica una sostituzione regex ai nomi dei file
         
         Args:
             files: Lista dei file da rinominare
-            pattern: Pattern regex da cercare
+            pattern: Pattern regex da cercare (stringa o già compilato)
             replacement: Stringa di sostituzione
             
         Returns:
             Lista dei nuovi nomi
         """
-        new_names = []
-        
         try:
             compiled_pattern = re.compile(pattern)
         except re.error as e:
             raise ValueError(f"Pattern regex non valido: {e}")
         
-        for file_path in files:
-            original_name = file_path.name
-            new_name = compiled_pattern.sub(replacement, original_name)
-            new_names.append(new_name)
+        # Pattern senza caratteri speciali e sostituzione senza escape:
+        # str.replace dà lo stesso risultato ed è molto più veloce
+        source = compiled_pattern.pattern
+        if (isinstance(source, str) and compiled_pattern.flags == re.UNICODE
+                and '\\' not in replacement and re.escape(source) == source):
+            return [file_path.name.replace(source, replacement) for file_path in files]
+        
+        # Lega il metodo una sola volta fuori dal ciclo
+        sub = compiled_pattern.sub
         
-        return new_names
+        return [sub(replacement, file_path.name) for file_path in files]
     
     def execute_rename(self, files: List[Path], new_names: List[str]) -> bool:
         """
@@ -287,53 +571,138 @@ class FileRenamer:
         Returns:
             True se tutte le operazioni sono riuscite
         """
-        success_count = 0
-        
-        if RICH_AVAILABLE:
-            progress = Progress()
-            task = progress.add_task("Rinomina file...", total=len(files))
+        # Verifica in memoria che due file della stessa cartella non abbiano
+        # la stessa destinazione, prima di toccare il filesystem
+        _dirname = os.path.dirname
+        _normcase = os.path.normcase
+        dirs = [_normcase(_dirname(os.fspath(f))) for f in files]
+        targets = Counter((d, _normcase(n)) for d, n in zip(dirs, new_names))
+        collisions = sorted({n for d, n in zip(dirs, new_names) if targets[d, _normcase(n)] > 1})
+        if collisions:
+            for name in collisions:
+                logger.error("Più file verrebbero rinominati in: %s", name)
+            return False
+        
+        # I file con nome invariato non richiedono nessuna operazione
+        to_rename = [(f, d, n) for f, d, n in zip(files, dirs, new_names) if f.name != n]
+        success_count = len(files) - len(to_rename)
+        
+        # Destinazioni che differiscono solo per il case: dove il filesystem
+        # non distingue maiuscole e minuscole sono lo stesso file, e due
+        # os.replace in parallelo si sovrascriverebbero. Queste rinomine
+        # vengono eseguite in sequenza, così il controllo di esistenza vede
+        # quelle già fatte
+        folded = Counter((d, n.casefold()) for _, d, n in to_rename)
+        serial = [(f, n) for f, d, n in to_rename if folded[d, n.casefold()] > 1]
+        parallel = [(f, n) for f, d, n in to_rename if folded[d, n.casefold()] == 1]
+        
+        use_progress = self.console is not None
+        if use_progress:
+            from rich.progress import Progress
+            
+            progress = Progress(console=self.console)
+            task = progress.add_task("Rinomina file...", total=len(to_rename))
             progress.start()
-        
-        for original_file, new_name in zip(files, new_names):
+            
+            # La barra viene aggiornata a blocchi (~200 aggiornamenti in tutto)
+            # invece di ridisegnarla per ogni singolo file
+            tick = max(1, len(to_rename) // 200)
+            pending_ticks = 0
+        
+        # Si lavora con stringhe e funzioni di os legate in locale,
+        # evitando di creare oggetti Path intermedi per ogni file
+        _fspath = os.fspath
+        _split = os.path.split
+        _join = os.path.join
+        _lexists = os.path.lexists
+        _replace = os.replace
+        dry_run = self.dry_run
+        record_operation = self._record_operation
+        
+        def rename_one(original_file: Path, new_name: str) -> bool:
+            # Rinomina un singolo file; eseguita nei thread del pool
             try:
-                new_path = original_file.parent / new_name
+                original_str = _fspath(original_file)
+                parent_str, original_name = _split(original_str)
+                new_path_str = _join(parent_str, new_name)
                 
-                # Verifica che il nuovo nome non esista già
-                if new_path.exists() and new_path != original_file:
-                    logging.warning(f"File già esistente: {new_name}")
-                    continue
+                # Verifica che il nuovo nome non esista già (un cambio di solo
+                # case sullo stesso file è ammesso anche dove il filesystem
+                # non distingue maiuscole e minuscole)
+                if _normcase(new_path_str) != _normcase(original_str) and _lexists(new_path_str):
+                    logger.warning("File già esistente: %s", new_name)
+                    return False
                 
-                if not self.dry_run:
+                if not dry_run:
                     # Esegue la rinomina
-                    original_file.rename(new_path)
-                    logging.info(f"Rinominato: {original_file.name} → {new_name}")
+                    _replace(original_str, new_path_str)
+                    logger.info("Rinominato: %s → %s", original_name, new_name)
                 else:
-                    logging.info(f"[DRY RUN] Rinomina: {original_file.name} → {new_name}")
+                    logger.info("[DRY RUN] Rinomina: %s → %s", original_name, new_name)
                 
                 # Salva l'operazione nel log
-                self.operations_log.append({
-                    'original': str(original_file),
-                    'new': str(new_path),
+                record_operation({
+                    'original': original_str,
+                    'new': new_path_str,
                     'timestamp': datetime.now().isoformat(),
                     'success': True
                 })
-                
-                success_count += 1
-                
-                if RICH_AVAILABLE:
-                    progress.update(task, advance=1)
+                return True
             
             except Exception as e:
-                logging.error(f"Errore rinominando {original_file.name}: {e}")
-                self.operations_log.append({
+                logger.error("Errore rinominando %s: %s", original_file.name, e)
+                record_operation({
                     'original': str(original_file),
                     'new': new_name,
                     'timestamp': datetime.now().isoformat(),
                     'success': False,
                     'error': str(e)
                 })
+                return False
         
-        if RICH_AVAILABLE:
+        def rename_serial(pairs: List[Tuple[Path, str]]) -> int:
+            # Rinomina in sequenza; restituisce il numero di successi
+            return sum(rename_one(f, n) for f, n in pairs)
+        
+        # Con log_format il log operazioni viene scritto man mano su disco
+        if self.log_format:
+            self._open_operations_log()
+        
+        # rename() è una syscall bloccante che rilascia il GIL: su dischi di
+        # rete più thread in parallelo riducono molto il tempo totale
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(rename_one, f, n) for f, n in parallel]
+                if serial:
+                    futures.append(executor.submit(rename_serial, serial))
+                try:
+                    for future in as_completed(futures):
+                        # Numero di file rinominati dal task (True conta 1)
+                        done = future.result()
+                        if not done:
+                            continue
+                        
+                        success_count += done
+                        
+                        if use_progress:
+                            pending_ticks += done
+                            if pending_ticks >= tick:
+                                progress.update(task, advance=pending_ticks)
+                                pending_ticks = 0
+                except BaseException:
+                    # Interruzione (es. Ctrl+C): annulla le rinomine non ancora avviate
+                    for future in futures:
+                        future.cancel()
+                    raise
+        
+        finally:
+            self._close_operations_log()
+        
+        if use_progress:
+            if pending_ticks:
+                progress.update(task, advance=pending_ticks)
             progress.stop()
         
         return success_count == len(files)
@@ -355,17 +724,74 @@ class FileRenamer:
         
         if format_type == "json":
             log_file = log_dir / f"operations_log_{timestamp}.json"
-            with open(log_file, 'w', encoding='utf-8') as f:
-                json.dump(self.operations_log, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(log_file, 'wb') as f:
+                    f.write(orjson.dumps(self.operations_log, option=orjson.OPT_INDENT_2))
+            else:
+                with open(log_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.operations_log, f, indent=2, ensure_ascii=False)
         
         elif format_type == "csv":
             log_file = log_dir / f"operations_log_{timestamp}.csv"
             with open(log_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=['original', 'new', 'timestamp', 'success', 'error'])
+                writer = csv.DictWriter(f, fieldnames=OPERATIONS_LOG_FIELDS)
                 writer.writeheader()
                 writer.writerows(self.operations_log)
         
-        logging.info(f"Log operazioni salvato in: {log_file}")
+        logger.info("Log operazioni salvato in: %s", log_file)
+    
+    def _open_operations_log(self) -> None:
+        """
+        Apre il file del log operazioni per scriverlo man mano
+        
+        Il formato json viene scritto come JSON Lines (un'operazione per riga),
+        così la memoria resta costante e un log interrotto resta leggibile.
+        """
+        log_dir = Path("logs")
+        log_dir.mkdir(exist_ok=True)
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        if self.log_format == "csv":
+            self._log_file = log_dir / f"operations_log_{timestamp}.csv"
+            self._log_fp = open(self._log_file, 'w', newline='', encoding='utf-8')
+            self._log_writer = csv.writer(self._log_fp)
+            self._log_writer.writerow(OPERATIONS_LOG_FIELDS)
+        else:
+            self._log_file = log_dir / f"operations_log_{timestamp}.jsonl"
+            if orjson is not None:
+                self._log_fp = open(self._log_file, 'wb')
+            else:
+                self._log_fp = open(self._log_file, 'w', encoding='utf-8')
+    
+    def _record_operation(self, entry: Dict) -> None:
+        """
+        Registra un'operazione sul file di log aperto o, in sua assenza, in memoria
+        
+        Args:
+            entry: Dati dell'operazione (original, new, timestamp, success, error)
+        """
+        with self._log_lock:
+            if self._log_fp is None:
+                self.operations_log.append(entry)
+            elif self._log_writer is not None:
+                self._log_writer.writerow([entry.get(field, '') for field in OPERATIONS_LOG_FIELDS])
+            elif orjson is not None:
+                self._log_fp.write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
+            else:
+                self._log_fp.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    
+    def _close_operations_log(self) -> None:
+        """
+        Chiude il file del log operazioni, se aperto
+        """
+        if self._log_fp is None:
+            return
+        
+        self._log_fp.close()
+        self._log_fp = None
+        self._log_writer = None
+        logger.info("Log operazioni salvato in: %s", self._log_file)
 
 
 def create_cli_parser() -> argparse.ArgumentParser:
@@ -455,6 +881,12 @@ Esempi di utilizzo:
         help='Simula le operazioni senza eseguirle'
     )
     
+    parser.add_argument(
+        '--no-rich',
+        action='store_true',
+        help='Disattiva Rich e usa un output testuale semplice (automatico se l\'output non è un terminale)'
+    )
+    
     parser.add_argument(
         '--log-level',
         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
@@ -465,7 +897,7 @@ Esempi di utilizzo:
     parser.add_argument(
         '--save-log',
         choices=['json', 'csv'],
-        help='Salva il log delle operazioni nel formato specificato'
+        help='Salva il log delle operazioni nel formato specificato (json = JSON Lines)'
     )
     
     parser.add_argument(
@@ -500,7 +932,8 @@ def main():
     
     try:
         # Crea il FileRenamer
-        renamer = FileRenamer(args.directory, dry_run=args.dry_run)
+        renamer = FileRenamer(args.directory, dry_run=args.dry_run, log_format=args.save_log,
+                              no_rich=args.no_rich)
         
         # Ottiene i file da processare
         files = renamer.get_files(args.pattern, args.recursive)
@@ -524,9 +957,8 @@ def main():
         
         # Conferma dell'utente (solo se non è dry run)
         if not args.dry_run:
-            if RICH_AVAILABLE:
-                console = Console()
-                confirm = console.input("\n❓ Procedere con la rinomina? [y/N]: ")
+            if renamer.console is not None:
+                confirm = renamer.console.input("\n❓ Procedere con la rinomina? [y/N]: ")
             else:
                 confirm = input("\n❓ Procedere con la rinomina? [y/N]: ")
             
@@ -541,16 +973,12 @@ def main():
             print(f"✅ Rinominati con successo {len(files)} file!")
         else:
             print("⚠️  Alcune operazioni potrebbero non essere riuscite. Controlla i log.")
-        
-        # Salva il log se richiesto
-        if args.save_log:
-            renamer.save_operations_log(args.save_log)
     
     except KeyboardInterrupt:
         print("\n🛑 Operazione interrotta dall'utente")
         sys.exit(1)
     except Exception as e:
-        logging.error(f"Errore durante l'esecuzione: {e}")
+        logger.error("Errore durante l'esecuzione: %s", e)
         print(f"❌ Errore: {e}")
         sys.exit(1)
 
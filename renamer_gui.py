@@ -12,25 +12,246 @@ Versione: 1.0.0
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
+import tkinter.font as tkfont
 import os
 import sys
 import threading
+import time
+import queue
 import json
+import importlib.util
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional
-import subprocess
+from typing import TYPE_CHECKING, List, Optional
+from collections import deque
 import re
 
-# Importa la classe FileRenamer dal modulo CLI
-try:
+if TYPE_CHECKING:
     from cli_tool import FileRenamer
+
+# Serializzatore JSON veloce (opzionale): senza orjson si usa il modulo json
+try:
+    import orjson
 except ImportError:
+    orjson = None
+
+# La classe FileRenamer viene importata dal modulo CLI solo alla prima
+# scansione (vedi FileRenamerGUI.renamer_cls): qui si verifica che ci sia
+if importlib.util.find_spec("cli_tool") is None:
     # Se non riesce a importare, mostra un messaggio di errore
     print("❌ Errore: file_renamer_cli.py non trovato!")
     print("Assicurati che file_renamer_cli.py sia nella stessa directory.")
     sys.exit(1)
 
+# Righe scorse per ogni scatto della rotellina nelle liste virtuali
+SCROLL_UNITS = 3
+
+# File per blocco inviati dal thread di scansione alla GUI
+SCAN_BATCH_SIZE = 256
+
+# Blocchi portati nella GUI per ogni richiamo: il resto attende che Tk abbia
+# ridisegnato la finestra
+SCAN_DRAIN_BATCHES = 8
+
+# Fotogrammi dello spinner mostrato nella barra di stato durante la scansione
+SPINNER_FRAMES = "|/-\\"
+
+# Unità per format_size e relativi divisori, indicizzati per potenze di 1024
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+SIZE_DIVISORS = (1, 1 << 10, 1 << 20, 1 << 30, 1 << 40)
+
+# Colori dei livelli di log
+LOG_COLORS = {
+    "INFO": "black",
+    "WARNING": "orange",
+    "ERROR": "red",
+    "SUCCESS": "green"
+}
+
+# Il log viene scritto nel widget a intervalli regolari e tiene solo le
+# ultime LOG_MAX_LINES righe
+LOG_FLUSH_MS = 200
+LOG_MAX_LINES = 5000
+
+# Righe del log lette dal widget per ogni blocco scritto da save_log
+LOG_SAVE_LINES = 4096
+
+# Tipi di file proposti dal dialogo di salvataggio del log
+_SAVE_LOG_EXTENSION = ".txt"
+_SAVE_LOG_FILETYPES = (("File di testo", "*.txt"), ("Tutti i file", "*.*"))
+
+# Apertura di una cartella nel file manager, scelta una volta sola in base
+# al sistema: il processo viene avviato senza attenderne la fine
+if sys.platform == "win32":
+    _open_folder = os.startfile
+else:
+    _FOLDER_OPENER = "open" if sys.platform == "darwin" else "xdg-open"
+    
+    def _open_folder(path: str):
+        import subprocess  # Serve solo qui: non rallenta l'avvio
+        
+        subprocess.Popen([_FOLDER_OPENER, path], close_fds=True)
+
+
+class VirtualTreeview(ttk.Treeview):
+    """
+    Treeview virtuale per liste molto lunghe
+    
+    Contiene solo gli item delle righe visibili: scorrendo ne vengono
+    aggiornati i valori prendendoli dalla lista completa, invece di creare
+    un item Tk per ogni file. La scrollbar va collegata con attach_scrollbar.
+    
+    Gli item vengono riusati per righe diverse, quindi la selezione è
+    disattivata: resterebbe sull'item e non sul file scelto.
+    """
+    
+    def __init__(self, parent, **kwargs):
+        kwargs.setdefault('selectmode', 'none')
+        super().__init__(parent, **kwargs)
+        self.rows = []  # Valori di tutte le righe
+        self.first_row = 0  # Indice della prima riga visibile
+        self._scroll_set = None  # Metodo set della scrollbar collegata
+        
+        self.bind('<Configure>', lambda event: self.refresh())
+        self.bind('<MouseWheel>', self._on_mousewheel)
+        self.bind('<Button-4>', lambda event: self._scroll_units(-SCROLL_UNITS))
+        self.bind('<Button-5>', lambda event: self._scroll_units(SCROLL_UNITS))
+        
+        # Tastiera: le frecce scorrono di una riga, PagSu/PagGiù di una pagina
+        self.bind('<Up>', lambda event: self._scroll_units(-1))
+        self.bind('<Down>', lambda event: self._scroll_units(1))
+        self.bind('<Prior>', lambda event: self._scroll_units(-self._visible_rows()))
+        self.bind('<Next>', lambda event: self._scroll_units(self._visible_rows()))
+    
+    def attach_scrollbar(self, scrollbar: ttk.Scrollbar):
+        """
+        Collega una scrollbar verticale alla lista virtuale
+        """
+        scrollbar.configure(command=self.yview)
+        self._scroll_set = scrollbar.set
+    
+    def set_rows(self, rows):
+        """
+        Sostituisce tutte le righe della lista
+        
+        Args:
+            rows: Valori delle colonne per ogni riga (anche un generatore)
+        """
+        self.rows = list(rows)
+        self.first_row = 0
+        self.refresh()
+    
+    def append_rows(self, rows: List[tuple]):
+        """
+        Aggiunge righe in fondo alla lista
+        
+        Se l'area visibile è già piena basta aggiornare la scrollbar.
+        
+        Args:
+            rows: Valori delle colonne per ogni riga
+        """
+        visible = self._visible_rows()
+        was_full = len(self.rows) >= self.first_row + visible
+        self.rows.extend(rows)
+        
+        if was_full:
+            self._update_scrollbar(visible)
+        else:
+            self.refresh()
+    
+    def yview(self, *args):
+        """
+        Comando della scrollbar: sposta la finestra delle righe visibili
+        
+        Senza argomenti restituisce la porzione visibile, come Treeview.yview.
+        """
+        if not args:
+            total = len(self.rows)
+            if not total:
+                return (0.0, 1.0)
+            shown = min(self._visible_rows(), total - self.first_row)
+            return (self.first_row / total, (self.first_row + shown) / total)
+        
+        if args[0] == 'moveto':
+            self.first_row = int(float(args[1]) * len(self.rows))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self._visible_rows()
+            self.first_row += amount
+        self.refresh()
+    
+    def refresh(self):
+        """
+        Mostra le righe a partire da first_row riusando gli item esistenti
+        """
+        count = self._visible_rows()
+        self.first_row = max(0, min(self.first_row, len(self.rows) - count))
+        window = self.rows[self.first_row:self.first_row + count]
+        
+        items = self.get_children()
+        for item, values in zip(items, window):
+            self.item(item, values=values)
+        
+        if len(items) > len(window):
+            self.delete(*items[len(window):])
+        else:
+            for values in window[len(items):]:
+                self.insert('', 'end', values=values)
+        
+        # Senza item il numero di righe è stimato dall'altezza configurata:
+        # quando Tk ha disegnato il primo item si ricalcola con la sua bbox
+        if not items and window:
+            self.after_idle(self.refresh)
+        
+        self._update_scrollbar(len(window))
+    
+    def _visible_rows(self) -> int:
+        """
+        Numero di righe che entrano nell'area visibile della treeview
+        """
+        items = self.get_children()
+        if items:
+            bbox = self.bbox(items[0])
+            if bbox:
+                header, row_height = bbox[1], bbox[3]
+                return max(1, (self.winfo_height() - header) // row_height)
+        
+        # Finché la treeview non è disegnata si usa l'altezza configurata
+        return int(self.cget('height'))
+    
+    def _update_scrollbar(self, shown: int):
+        """
+        Aggiorna la scrollbar collegata in base alle righe mostrate
+        """
+        if self._scroll_set is None:
+            return
+        
+        total = len(self.rows)
+        if total:
+            self._scroll_set(self.first_row / total, (self.first_row + shown) / total)
+        else:
+            self._scroll_set(0, 1)
+    
+    def _on_mousewheel(self, event):
+        """
+        Scorre la lista con la rotellina (Windows e macOS)
+        """
+        # Windows usa multipli di 120 per scatto, macOS valori piccoli
+        if abs(event.delta) >= 120:
+            units = -event.delta // 120
+        else:
+            units = -event.delta
+        return self._scroll_units(units * SCROLL_UNITS)
+    
+    def _scroll_units(self, units: int) -> str:
+        """
+        Sposta la finestra di righe e blocca lo scorrimento standard di Tk
+        """
+        self.first_row += units
+        self.refresh()
+        return "break"
+
 
 class FileRenamerGUI:
     """
@@ -40,6 +261,23 @@ class FileRenamerGUI:
     di usare tutte le funzionalità del CLI tool in modo visuale.
     """
     
+    # Variabili Tk salvate nelle impostazioni e relative chiavi nel file
+    _SETTINGS_VARS = (
+        ('dir_var', 'last_directory'),
+        ('pattern_var', 'pattern'),
+        ('recursive_var', 'recursive'),
+        ('rename_type', 'rename_type'),
+        ('dry_run_var', 'dry_run'),
+        ('backup_var', 'backup'),
+        ('log_format_var', 'log_format'),
+        ('base_name_var', 'base_name'),
+        ('start_number_var', 'start_number'),
+        ('custom_pattern_var', 'custom_pattern'),
+        ('case_type_var', 'case_type'),
+        ('regex_pattern_var', 'regex_pattern'),
+        ('regex_replace_var', 'regex_replace'),
+    )
+    
     def __init__(self, root):
         """
         Inizializza l'interfaccia grafica
@@ -49,18 +287,31 @@ class FileRenamerGUI:
         """
         self.root = root
         self.renamer = None
+        self._renamer_cls = None  # FileRenamer, importato al primo utilizzo
+        self._saved_settings = None  # Impostazioni come sono sul disco
         self.files_to_process = []
         self.new_names = []
+        
+        # Percorsi, directory e nomi dei file come stringhe, in parallelo a
+        # files_to_process: i cicli di anteprima e rinomina usano questi
+        self._file_paths = []
+        self._file_dirs = []
+        self._file_names = []
         self.selected_directory = ""
+        self._log_queue = deque(maxlen=LOG_MAX_LINES)  # Messaggi da scrivere nel log
         
         # Configurazione finestra principale
         self.setup_main_window()
         
         # Creazione dell'interfaccia
         self.create_widgets()
+        self.root.after(LOG_FLUSH_MS, self._flush_log_periodically)
+        
+        # Variabili delle impostazioni per chiave, lette e scritte in blocco
+        self._vars = {key: getattr(self, attr) for attr, key in self._SETTINGS_VARS}
         
-        # Caricamento configurazioni salvate
-        self.load_settings()
+        # Caricamento configurazioni salvate, dopo che la finestra è apparsa
+        self.root.after_idle(self.load_settings)
     
     def setup_main_window(self):
         """
@@ -86,6 +337,13 @@ class FileRenamerGUI:
         style.configure('Success.TLabel', foreground='green')
         style.configure('Error.TLabel', foreground='red')
         style.configure('Warning.TLabel', foreground='orange')
+        
+        # Font con nome usati da AboutDialog, creati una volta sola: restano
+        # in Tk finché la GUI ne tiene il riferimento
+        self._about_fonts = (
+            tkfont.Font(self.root, name='AboutTitle', family='Helvetica', size=16, weight='bold'),
+            tkfont.Font(self.root, name='AboutVersion', family='Helvetica', size=10)
+        )
     
     def create_widgets(self):
         """
@@ -156,8 +414,8 @@ class FileRenamerGUI:
         ttk.Checkbutton(pattern_frame, text="Ricerca ricorsiva", variable=self.recursive_var).pack(side='left')
         
         # Bottone scansione
-        scan_button = ttk.Button(filter_frame, text="🔍 Scansiona File", command=self.scan_files)
-        scan_button.pack(pady=(10, 0))
+        self.scan_button = ttk.Button(filter_frame, text="🔍 Scansiona File", command=self.scan_files)
+        self.scan_button.pack(pady=(10, 0))
         
         # Lista file trovati
         files_frame = ttk.LabelFrame(frame, text="File Trovati", padding=10)
@@ -165,7 +423,7 @@ class FileRenamerGUI:
         
         # Treeview per mostrare i file
         columns = ('Nome', 'Dimensione', 'Ultima Modifica')
-        self.files_tree = ttk.Treeview(files_frame, columns=columns, show='headings', height=10)
+        self.files_tree = VirtualTreeview(files_frame, columns=columns, show='headings', height=10)
         
         # Configurazione colonne
         self.files_tree.heading('Nome', text='Nome File')
@@ -177,8 +435,8 @@ class FileRenamerGUI:
         self.files_tree.column('Ultima Modifica', width=150)
         
         # Scrollbar per la treeview
-        scrollbar = ttk.Scrollbar(files_frame, orient='vertical', command=self.files_tree.yview)
-        self.files_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar = ttk.Scrollbar(files_frame, orient='vertical')
+        self.files_tree.attach_scrollbar(scrollbar)
         
         self.files_tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
@@ -218,8 +476,20 @@ class FileRenamerGUI:
         self.options_frame = ttk.LabelFrame(frame, text="Configurazione", padding=10)
         self.options_frame.pack(fill='x', pady=(0, 10))
         
+        # Un frame di opzioni per ogni tipo, creati una volta sola: al cambio
+        # di tipo si mostra quello giusto e i valori inseriti restano
+        self._option_frames = {}
+        for rename_type, create_options in (("sequential", self.create_sequential_options),
+                                            ("pattern", self.create_pattern_options),
+                                            ("case", self.create_case_options),
+                                            ("regex", self.create_regex_options)):
+            option_frame = ttk.Frame(self.options_frame)
+            create_options(option_frame)
+            self._option_frames[rename_type] = option_frame
+        
         # Inizializza con opzioni sequenziali
-        self.create_sequential_options()
+        self._shown_options = None
+        self.on_rename_type_change()
         
         # Sezione opzioni avanzate
         advanced_frame = ttk.LabelFrame(frame, text="Opzioni Avanzate", padding=10)
@@ -260,7 +530,7 @@ class FileRenamerGUI:
         preview_frame.pack(fill='both', expand=True, pady=(0, 10))
         
         columns = ('Originale', 'Nuovo', 'Stato')
-        self.preview_tree = ttk.Treeview(preview_frame, columns=columns, show='headings', height=15)
+        self.preview_tree = VirtualTreeview(preview_frame, columns=columns, show='headings', height=15)
         
         # Configurazione colonne
         self.preview_tree.heading('Originale', text='Nome Originale')
@@ -272,8 +542,8 @@ class FileRenamerGUI:
         self.preview_tree.column('Stato', width=100)
         
         # Scrollbar per anteprima
-        preview_scrollbar = ttk.Scrollbar(preview_frame, orient='vertical', command=self.preview_tree.yview)
-        self.preview_tree.configure(yscrollcommand=preview_scrollbar.set)
+        preview_scrollbar = ttk.Scrollbar(preview_frame, orient='vertical')
+        self.preview_tree.attach_scrollbar(preview_scrollbar)
         
         self.preview_tree.pack(side='left', fill='both', expand=True)
         preview_scrollbar.pack(side='right', fill='y')
@@ -330,6 +600,10 @@ class FileRenamerGUI:
         self.log_text = scrolledtext.ScrolledText(log_frame, height=20, font=('Courier', 9))
         self.log_text.pack(fill='both', expand=True)
         
+        # Un tag colorato per ogni livello, configurato una volta sola
+        for level, color in LOG_COLORS.items():
+            self.log_text.tag_config(f"color_{level}", foreground=color)
+        
         # Bottoni per gestire i log
         log_buttons = ttk.Frame(log_frame)
         log_buttons.pack(fill='x', pady=(5, 0))
@@ -359,28 +633,24 @@ class FileRenamerGUI:
         """
         Gestisce il cambio di tipo di rinomina
         """
-        # Pulisce il frame delle opzioni
-        for widget in self.options_frame.winfo_children():
-            widget.destroy()
-        
-        # Crea le opzioni specifiche per il tipo selezionato
-        rename_type = self.rename_type.get()
-        
-        if rename_type == "sequential":
-            self.create_sequential_options()
-        elif rename_type == "pattern":
-            self.create_pattern_options()
-        elif rename_type == "case":
-            self.create_case_options()
-        elif rename_type == "regex":
-            self.create_regex_options()
+        # Nasconde le opzioni mostrate finora
+        if self._shown_options is not None:
+            self._shown_options.pack_forget()
+        
+        # Mostra le opzioni specifiche per il tipo selezionato
+        self._shown_options = self._option_frames.get(self.rename_type.get())
+        if self._shown_options is not None:
+            self._shown_options.pack(fill='x')
     
-    def create_sequential_options(self):
+    def create_sequential_options(self, parent):
         """
         Crea le opzioni per rinomina sequenziale
+        
+        Args:
+            parent: Frame in cui creare le opzioni
         """
         # Nome base
-        base_frame = ttk.Frame(self.options_frame)
+        base_frame = ttk.Frame(parent)
         base_frame.pack(fill='x', pady=(0, 5))
         
         ttk.Label(base_frame, text="Nome base:").pack(side='left')
@@ -393,16 +663,19 @@ class FileRenamerGUI:
         ttk.Entry(base_frame, textvariable=self.start_number_var, width=10).pack(side='left', padx=(5, 0))
         
         # Esempio
-        example_label = ttk.Label(self.options_frame, text="Esempio: file_001.txt, file_002.txt, ...", 
+        example_label = ttk.Label(parent, text="Esempio: file_001.txt, file_002.txt, ...", 
                                  foreground='gray')
         example_label.pack(anchor='w', pady=(5, 0))
     
-    def create_pattern_options(self):
+    def create_pattern_options(self, parent):
         """
         Crea le opzioni per pattern personalizzato
+        
+        Args:
+            parent: Frame in cui creare le opzioni
         """
         # Pattern
-        pattern_frame = ttk.Frame(self.options_frame)
+        pattern_frame = ttk.Frame(parent)
         pattern_frame.pack(fill='x', pady=(0, 5))
         
         ttk.Label(pattern_frame, text="Pattern:").pack(side='left')
@@ -417,14 +690,17 @@ class FileRenamerGUI:
                     "{date} = data (YYYY-MM-DD)\n"
                     "{time} = ora (HH-MM-SS)")
         
-        help_label = ttk.Label(self.options_frame, text=help_text, foreground='gray', font=('Courier', 8))
+        help_label = ttk.Label(parent, text=help_text, foreground='gray', font=('Courier', 8))
         help_label.pack(anchor='w', pady=(5, 0))
     
-    def create_case_options(self):
+    def create_case_options(self, parent):
         """
         Crea le opzioni per trasformazione case
+        
+        Args:
+            parent: Frame in cui creare le opzioni
         """
-        ttk.Label(self.options_frame, text="Trasformazione:").pack(anchor='w')
+        ttk.Label(parent, text="Trasformazione:").pack(anchor='w')
         
         self.case_type_var = tk.StringVar(value="lower")
         
@@ -436,15 +712,18 @@ class FileRenamerGUI:
         ]
         
         for text, value in cases:
-            ttk.Radiobutton(self.options_frame, text=text, variable=self.case_type_var, 
+            ttk.Radiobutton(parent, text=text, variable=self.case_type_var, 
                            value=value).pack(anchor='w', padx=(10, 0))
     
-    def create_regex_options(self):
+    def create_regex_options(self, parent):
         """
         Crea le opzioni per regex
+        
+        Args:
+            parent: Frame in cui creare le opzioni
         """
         # Pattern regex
-        pattern_frame = ttk.Frame(self.options_frame)
+        pattern_frame = ttk.Frame(parent)
         pattern_frame.pack(fill='x', pady=(0, 5))
         
         ttk.Label(pattern_frame, text="Pattern:").pack(side='left')
@@ -452,7 +731,7 @@ class FileRenamerGUI:
         ttk.Entry(pattern_frame, textvariable=self.regex_pattern_var, width=25).pack(side='left', padx=(5, 0))
         
         # Sostituzione
-        replace_frame = ttk.Frame(self.options_frame)
+        replace_frame = ttk.Frame(parent)
         replace_frame.pack(fill='x', pady=(0, 5))
         
         ttk.Label(replace_frame, text="Sostituisci:").pack(side='left')
@@ -460,7 +739,7 @@ class FileRenamerGUI:
         ttk.Entry(replace_frame, textvariable=self.regex_replace_var, width=25).pack(side='left', padx=(5, 0))
         
         # Esempio
-        example_label = ttk.Label(self.options_frame, 
+        example_label = ttk.Label(parent, 
                                  text="Esempio: IMG_(\\d+) → photo_\\1", 
                                  foreground='gray')
         example_label.pack(anchor='w', pady=(5, 0))
@@ -475,9 +754,25 @@ class FileRenamerGUI:
             self.selected_directory = directory
             self.update_status("Directory selezionata: " + directory)
     
+    @property
+    def renamer_cls(self):
+        """
+        Classe FileRenamer, importata da cli_tool al primo utilizzo
+        
+        Il modulo CLI non serve per disegnare la finestra: importarlo solo
+        alla prima scansione rende più rapido l'avvio della GUI.
+        """
+        if self._renamer_cls is None:
+            from cli_tool import FileRenamer
+            self._renamer_cls = FileRenamer
+        return self._renamer_cls
+    
     def scan_files(self):
         """
         Scansiona i file nella directory selezionata
+        
+        La scansione gira in un thread separato e le righe arrivano alla GUI
+        a blocchi tramite una coda, così la finestra resta reattiva.
         """
         directory = self.dir_var.get()
         if not directory:
@@ -489,34 +784,132 @@ class FileRenamerGUI:
         
         try:
             # Crea il FileRenamer
-            self.renamer = FileRenamer(directory, dry_run=True)
+            self.renamer = self.renamer_cls(directory, dry_run=True)
+        except Exception as e:
+            messagebox.showerror("Errore", f"Errore durante la scansione: {str(e)}")
+            self.log_message(f"Errore scansione: {str(e)}", "ERROR")
+            return
+        
+        # Pulisce i risultati precedenti
+        self.files_to_process = []
+        self._file_paths, self._file_dirs, self._file_names = [], [], []
+        self.files_tree.set_rows([])
+        self.scan_button.config(state='disabled')
+        
+        # Avvia la scansione in un thread separato
+        scan_queue = queue.Queue()
+        thread = threading.Thread(target=self._scan_worker,
+                                  args=(self.renamer, pattern, recursive, scan_queue))
+        thread.daemon = True
+        thread.start()
+        
+        self.root.after(30, self._drain_scan_queue, scan_queue, 0)
+    
+    def _scan_worker(self, renamer: "FileRenamer", pattern: str, recursive: bool, scan_queue: queue.Queue):
+        """
+        Cerca i file e prepara le righe della treeview (gira in un thread separato)
+        
+        Args:
+            renamer: FileRenamer della directory da scansionare
+            pattern: Pattern di ricerca
+            recursive: Se True, cerca anche nelle sottodirectory
+            scan_queue: Coda su cui inviare i blocchi di righe e l'esito finale
+        """
+        try:
+            # Lo stat è quello già letto da os.scandir durante la scansione,
+            # senza un'altra chiamata di sistema per file
+            get_file_stat = renamer.get_file_stat
             
-            # Ottiene i file
-            files = self.renamer.get_files(pattern, recursive)
-            self.files_to_process = files
+            # Dimensioni e date (al minuto) si ripetono spesso tra i file:
+            # ogni valore viene formattato una volta sola e poi riusato
+            sizes = {}
+            dates = {}
             
-            # Pulisce la treeview
-            for item in self.files_tree.get_children():
-                self.files_tree.delete(item)
+            # time.strftime su localtime evita di creare un datetime per file
+            localtime = time.localtime
+            strftime = time.strftime
             
-            # Popola la treeview
-            for file_path in files:
-                stat = file_path.stat()
-                size = self.format_size(stat.st_size)
-                modified = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M")
+            split = os.path.split
+            files, paths, dirs, names = [], [], [], []
+            batch = []
+            for file_path in renamer.iter_files(pattern, recursive):
+                path = os.fspath(file_path)
+                directory, name = split(path)
+                files.append(file_path)
+                paths.append(path)
+                dirs.append(directory)
+                names.append(name)
                 
-                self.files_tree.insert('', 'end', values=(file_path.name, size, modified))
-            
-            # Aggiorna il contatore
-            self.files_count_label.config(text=f"Trovati {len(files)} file")
-            self.update_status(f"Trovati {len(files)} file")
-            
-            # Log
-            self.log_message(f"Scansione completata: {len(files)} file trovati")
+                stat = get_file_stat(file_path)
+                
+                size = sizes.get(stat.st_size)
+                if size is None:
+                    size = sizes[stat.st_size] = self.format_size(stat.st_size)
+                
+                minute = int(stat.st_mtime // 60)
+                modified = dates.get(minute)
+                if modified is None:
+                    modified = dates[minute] = strftime("%Y-%m-%d %H:%M", localtime(stat.st_mtime))
+                
+                batch.append((name, size, modified))
+                
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    scan_queue.put(("rows", batch))
+                    batch = []
             
+            scan_queue.put(("rows", batch))
+            scan_queue.put(("done", (files, paths, dirs, names)))
         except Exception as e:
-            messagebox.showerror("Errore", f"Errore durante la scansione: {str(e)}")
-            self.log_message(f"Errore scansione: {str(e)}", "ERROR")
+            scan_queue.put(("error", e))
+    
+    def _drain_scan_queue(self, scan_queue: queue.Queue, tick: int):
+        """
+        Porta nella GUI i risultati arrivati dal thread di scansione
+        
+        Si richiama con root.after finché il thread non segnala la fine. Ogni
+        richiamo gestisce al massimo SCAN_DRAIN_BATCHES blocchi: se in coda ce
+        ne sono altri riprende con after_idle, dopo che Tk ha ridisegnato.
+        
+        Args:
+            scan_queue: Coda riempita da _scan_worker
+            tick: Numero di richiami, usato per animare lo spinner
+        """
+        more = False
+        try:
+            for _ in range(SCAN_DRAIN_BATCHES):
+                kind, payload = scan_queue.get_nowait()
+                
+                if kind == "rows":
+                    self.files_tree.append_rows(payload)
+                    continue
+                
+                self.scan_button.config(state='normal')
+                if kind == "done":
+                    files, self._file_paths, self._file_dirs, self._file_names = payload
+                    self.files_to_process = files
+                    
+                    # Aggiorna il contatore
+                    self.files_count_label.config(text=f"Trovati {len(files)} file")
+                    self.update_status(f"Trovati {len(files)} file")
+                    
+                    # Log
+                    self.log_message(f"Scansione completata: {len(files)} file trovati")
+                else:
+                    self.update_status("Scansione non riuscita")
+                    messagebox.showerror("Errore", f"Errore durante la scansione: {str(payload)}")
+                    self.log_message(f"Errore scansione: {str(payload)}", "ERROR")
+                return
+            more = True
+        except queue.Empty:
+            pass
+        
+        spinner = SPINNER_FRAMES[tick % len(SPINNER_FRAMES)]
+        self.update_status(f"{spinner} Scansione in corso... {len(self.files_tree.rows)} file")
+        
+        if more:
+            self.root.after_idle(self._drain_scan_queue, scan_queue, tick + 1)
+        else:
+            self.root.after(30, self._drain_scan_queue, scan_queue, tick + 1)
     
     def generate_preview(self):
         """
@@ -544,25 +937,18 @@ class FileRenamerGUI:
                 self.new_names = self.renamer.rename_case_transform(self.files_to_process, case_type)
             
             elif rename_type == "regex":
-                regex_pattern = self.regex_pattern_var.get()
+                # Il pattern viene validato e compilato una volta sola
+                try:
+                    regex_pattern = re.compile(self.regex_pattern_var.get())
+                except re.error as e:
+                    messagebox.showerror("Errore", f"Pattern regex non valido: {e}")
+                    return
                 replacement = self.regex_replace_var.get()
                 self.new_names = self.renamer.apply_regex_replacement(self.files_to_process, regex_pattern, replacement)
             
-            # Pulisce la treeview dell'anteprima
-            for item in self.preview_tree.get_children():
-                self.preview_tree.delete(item)
-            
-            # Popola l'anteprima
-            for original, new_name in zip(self.files_to_process, self.new_names):
-                # Verifica se il nuovo nome è valido
-                if new_name == original.name:
-                    status = "Invariato"
-                elif Path(original.parent / new_name).exists():
-                    status = "Conflitto"
-                else:
-                    status = "OK"
-                
-                self.preview_tree.insert('', 'end', values=(original.name, new_name, status))
+            # Popola l'anteprima: le righe vengono prodotte in un solo passaggio
+            # e finiscono direttamente nella lista virtuale
+            self.preview_tree.set_rows(self._preview_rows(self._file_dirs, self._file_names, self.new_names))
             
             # Abilita il bottone di esecuzione
             self.execute_button.config(state='normal')
@@ -573,6 +959,47 @@ class FileRenamerGUI:
             messagebox.showerror("Errore", f"Errore durante la generazione dell'anteprima: {str(e)}")
             self.log_message(f"Errore anteprima: {str(e)}", "ERROR")
     
+    def _preview_rows(self, dirs: List[str], names: List[str], new_names: List[str]):
+        """
+        Produce le righe dell'anteprima (nome originale, nuovo nome, stato)
+        
+        I nomi già presenti vengono letti una volta per directory invece di
+        uno stat per file. Il confronto più economico (nome invariato) viene
+        fatto per primo e nessun oggetto Path viene creato per riga.
+        
+        Args:
+            dirs: Directory dei file originali
+            names: Nomi dei file originali
+            new_names: Lista dei nuovi nomi
+        """
+        existing_names = {}
+        _normcase = os.path.normcase
+        
+        for directory, name, new_name in zip(dirs, names, new_names):
+            # Verifica se il nuovo nome è valido
+            if new_name == name:
+                status = "Invariato"
+            else:
+                # I nomi sono confrontati con normcase, come nel ciclo di
+                # rinomina: su Windows "FOO.TXT" occupa anche "foo.txt"
+                # Con una directory relativa (es. ".") i file della cartella
+                # corrente hanno directory vuota: os.listdir vuole os.curdir
+                dir_names = existing_names.get(directory)
+                if dir_names is None:
+                    dir_names = existing_names[directory] = set(map(_normcase, os.listdir(directory or os.curdir)))
+                
+                # Un cambio di solo case sullo stesso file non è un conflitto
+                new_key = _normcase(new_name)
+                if new_key in dir_names and new_key != _normcase(name):
+                    status = "Conflitto"
+                else:
+                    status = "OK"
+                
+                # Anche i nomi prodotti dal batch occupano la directory
+                dir_names.add(new_key)
+            
+            yield (name, new_name, status)
+    
     def execute_rename(self):
         """
         Esegue la rinomina dei file
@@ -606,39 +1033,56 @@ class FileRenamerGUI:
             success_count = 0
             error_count = 0
             
-            for i, (original_file, new_name) in enumerate(zip(self.files_to_process, self.new_names)):
+            # Backup se richiesto: tutte le copie prima di qualsiasi rinomina,
+            # così un backup fallito annulla l'operazione senza modifiche
+            if not self.renamer.dry_run and self.backup_var.get():
+                if not self.backup_files(self.files_to_process):
+                    return
+                self.progress_var.set(0)
+            
+            # Nel ciclo si lavora con le stringhe preparate dalla scansione e
+            # funzioni di os legate in locale, senza oggetti Path per file
+            dry_run = self.renamer.dry_run
+            join = os.path.join
+            exists = os.path.exists
+            normcase = os.path.normcase
+            replace = os.replace
+            
+            # La progress bar viene aggiornata a blocchi (~200 aggiornamenti in
+            # tutto): ogni aggiornamento è un ridisegno di Tk
+            update_every = max(1, total_files // 200)
+            
+            files = zip(self._file_paths, self._file_dirs, self._file_names, self.new_names)
+            for i, (src, directory, name, new_name) in enumerate(files):
                 try:
-                    new_path = original_file.parent / new_name
+                    dst = join(directory, new_name)
                     
                     # Verifica conflitti
-                    if new_path.exists() and new_path != original_file:
+                    if exists(dst) and normcase(dst) != normcase(src):
                         self.log_message(f"Conflitto: {new_name} già esistente", "WARNING")
                         error_count += 1
                         continue
                     
-                    if not self.renamer.dry_run:
-                        # Backup se richiesto
-                        if self.backup_var.get():
-                            backup_dir = original_file.parent / "backup"
-                            backup_dir.mkdir(exist_ok=True)
-                            backup_path = backup_dir / original_file.name
-                            original_file.copy(backup_path)
-                        
-                        # Rinomina
-                        original_file.rename(new_path)
-                        self.log_message(f"Rinominato: {original_file.name} → {new_name}")
+                    if not dry_run:
+                        # Rinomina (os.replace: stessa semantica su tutti i sistemi)
+                        replace(src, dst)
+                        self.log_message(f"Rinominato: {name} → {new_name}")
                     else:
-                        self.log_message(f"[DRY RUN] Rinomina: {original_file.name} → {new_name}")
+                        self.log_message(f"[DRY RUN] Rinomina: {name} → {new_name}")
                     
                     success_count += 1
                     
                 except Exception as e:
                     error_count += 1
-                    self.log_message(f"Errore rinominando {original_file.name}: {str(e)}", "ERROR")
+                    self.log_message(f"Errore rinominando {name}: {str(e)}", "ERROR")
                 
                 # Aggiorna progress bar
-                progress = ((i + 1) / total_files) * 100
-                self.progress_var.set(progress)
+                if (i + 1) % update_every == 0:
+                    progress = ((i + 1) / total_files) * 100
+                    self.progress_var.set(progress)
+            
+            if total_files:
+                self.progress_var.set(100)
             
             # Aggiorna statistiche
             self.update_stats(success_count, error_count, total_files)
@@ -662,13 +1106,66 @@ class FileRenamerGUI:
             self.log_message(f"Errore durante l'esecuzione: {str(e)}", "ERROR")
             messagebox.showerror("Errore", f"Errore durante l'esecuzione: {str(e)}")
     
+    def backup_files(self, files: List[Path]) -> bool:
+        """
+        Copia i file nella sottocartella backup della loro directory
+        
+        Le copie girano in parallelo: shutil.copy2 rilascia il GIL durante
+        lettura e scrittura, quindi più thread sovrappongono l'I/O.
+        
+        Args:
+            files: File da copiare
+            
+        Returns:
+            True se tutte le copie sono riuscite
+        """
+        import shutil
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        self.update_status("Backup in corso...")
+        
+        # Crea ogni cartella di backup una volta sola
+        backup_dirs = {}
+        for parent in {file_path.parent for file_path in files}:
+            backup_dir = parent / "backup"
+            backup_dir.mkdir(exist_ok=True)
+            backup_dirs[parent] = backup_dir
+        
+        total_files = len(files)
+        update_every = max(1, total_files // 200)
+        failed = 0
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(shutil.copy2, file_path, backup_dirs[file_path.parent] / file_path.name): file_path
+                for file_path in files
+            }
+            
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    future.result()
+                except Exception as e:
+                    failed += 1
+                    self.log_message(f"Errore nel backup di {futures[future].name}: {str(e)}", "ERROR")
+                
+                if done % update_every == 0 or done == total_files:
+                    self.progress_var.set((done / total_files) * 100)
+        
+        if failed:
+            self.log_message(f"Backup non riuscito per {failed} file: rinomina annullata", "ERROR")
+            self.update_status("Rinomina annullata")
+            messagebox.showerror("Errore", f"Backup non riuscito per {failed} file.\nNessun file è stato rinominato.")
+            return False
+        
+        self.log_message(f"Backup completato: {total_files} file copiati")
+        return True
+    
     def clear_preview(self):
         """
         Pulisce l'anteprima e resetta lo stato
         """
         # Pulisce la treeview dell'anteprima
-        for item in self.preview_tree.get_children():
-            self.preview_tree.delete(item)
+        self.preview_tree.set_rows([])
         
         # Resetta le variabili
         self.new_names = []
@@ -692,40 +1189,71 @@ class FileRenamerGUI:
         """
         Aggiunge un messaggio al log
         
+        Il messaggio viene solo accodato (anche da altri thread): lo scrive nel
+        widget flush_log, richiamato periodicamente dal thread della GUI.
+        
         Args:
             message: Il messaggio da loggare
             level: Livello del messaggio (INFO, WARNING, ERROR, SUCCESS)
         """
         timestamp = datetime.now().strftime("%H:%M:%S")
         
-        # Definisce i colori per i diversi livelli
-        colors = {
-            "INFO": "black",
-            "WARNING": "orange",
-            "ERROR": "red",
-            "SUCCESS": "green"
-        }
-        
         # Formatta il messaggio
-        formatted_message = f"[{timestamp}] {level}: {message}\n"
+        self._log_queue.append((level, f"[{timestamp}] {level}: {message}\n"))
+    
+    def flush_log(self):
+        """
+        Scrive nel widget del log i messaggi accodati
         
-        # Aggiunge al log text widget
-        self.log_text.insert(tk.END, formatted_message)
-        self.log_text.see(tk.END)  # Scrolla alla fine
+        I messaggi consecutivi dello stesso livello vengono uniti in un solo
+        testo colorato dal tag del livello, e tutti i testi finiscono nel
+        widget con un'unica chiamata a Text.insert.
+        """
+        if not self._log_queue:
+            return
         
-        # Colora il messaggio
-        line_start = f"{self.log_text.index(tk.END)}-1l"
-        line_end = f"{self.log_text.index(tk.END)}-1c"
+        # Scrolla alla fine solo se l'utente sta già guardando il fondo
+        at_bottom = self.log_text.yview()[1] > 0.99
         
-        if level in colors:
-            tag_name = f"color_{level}"
-            self.log_text.tag_config(tag_name, foreground=colors[level])
-            self.log_text.tag_add(tag_name, line_start, line_end)
+        # Raggruppa i messaggi consecutivi dello stesso livello
+        runs = []
+        next_message = self._log_queue.popleft
+        while self._log_queue:
+            level, text = next_message()
+            if runs and runs[-1][0] == level:
+                runs[-1][1].append(text)
+            else:
+                runs.append((level, [text]))
+        
+        # Text.insert accetta più coppie testo/tag nella stessa chiamata
+        insert_args = []
+        for level, texts in runs:
+            insert_args.append("".join(texts))
+            insert_args.append((f"color_{level}",) if level in LOG_COLORS else ())
+        self.log_text.insert(tk.END, *insert_args)
+        
+        # Tiene solo le ultime LOG_MAX_LINES righe
+        lines = int(self.log_text.index('end-1c').split('.')[0])
+        if lines > LOG_MAX_LINES:
+            self.log_text.delete('1.0', f'end-{LOG_MAX_LINES + 1}l')
+        
+        # Un solo spostamento alla fine: yview_moveto non deve calcolare la
+        # posizione di un indice come see()
+        if at_bottom:
+            self.log_text.yview_moveto(1.0)
+    
+    def _flush_log_periodically(self):
+        """
+        Scrive il log accodato e si riprogramma dopo LOG_FLUSH_MS
+        """
+        self.flush_log()
+        self.root.after(LOG_FLUSH_MS, self._flush_log_periodically)
     
     def clear_log(self):
         """
         Pulisce il log
         """
+        self._log_queue.clear()
         self.log_text.delete(1.0, tk.END)
         self.update_status("Log pulito")
     
@@ -733,21 +1261,35 @@ class FileRenamerGUI:
         """
         Salva il log in un file
         """
-        content = self.log_text.get(1.0, tk.END)
-        if not content.strip():
+        self.flush_log()
+        
+        # Cerca un carattere non vuoto senza copiare tutto il testo del log
+        if not self.log_text.search(r'\S', '1.0', tk.END, regexp=True):
             messagebox.showinfo("Info", "Il log è vuoto!")
             return
         
         filename = filedialog.asksaveasfilename(
             title="Salva Log",
-            defaultextension=".txt",
-            filetypes=[("File di testo", "*.txt"), ("Tutti i file", "*.*")]
+            defaultextension=_SAVE_LOG_EXTENSION,
+            filetypes=_SAVE_LOG_FILETYPES
         )
         
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                # Il log viene letto dal widget a blocchi di LOG_SAVE_LINES
+                # righe, ognuno codificato e scritto subito senza copiare
+                # tutto il testo in memoria (a capo come in modalità testo)
+                last_line = int(self.log_text.index(tk.END).split('.')[0])
+                
+                def chunks():
+                    for start in range(1, last_line, LOG_SAVE_LINES):
+                        chunk = self.log_text.get(f'{start}.0', f'{start + LOG_SAVE_LINES}.0')
+                        if os.linesep != '\n':
+                            chunk = chunk.replace('\n', os.linesep)
+                        yield chunk.encode('utf-8')
+                
+                with open(filename, 'wb') as f:
+                    f.writelines(chunks())
                 messagebox.showinfo("Successo", f"Log salvato in: {filename}")
                 self.log_message(f"Log salvato in: {filename}")
             except Exception as e:
@@ -758,17 +1300,11 @@ class FileRenamerGUI:
         Apre la cartella dei log
         """
         log_dir = Path("logs")
-        if not log_dir.exists():
-            log_dir.mkdir()
+        log_dir.mkdir(exist_ok=True)
         
         # Apre la cartella con il file manager del sistema
         try:
-            if sys.platform == "win32":
-                os.startfile(str(log_dir))
-            elif sys.platform == "darwin":
-                subprocess.run(["open", str(log_dir)])
-            else:
-                subprocess.run(["xdg-open", str(log_dir)])
+            _open_folder(str(log_dir))
         except Exception as e:
             messagebox.showerror("Errore", f"Impossibile aprire la cartella: {str(e)}")
     
@@ -788,43 +1324,37 @@ class FileRenamerGUI:
         Returns:
             Stringa formattata (es. "1.5 MB")
         """
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} TB"
+        if size_bytes <= 0:
+            return f"{size_bytes:.1f} B"
+        
+        # L'unità si ricava dal numero di bit: ogni 10 bit è un fattore 1024
+        index = min((size_bytes.bit_length() - 1) // 10, 4)
+        return f"{size_bytes / SIZE_DIVISORS[index]:.1f} {SIZE_UNITS[index]}"
     
     def save_settings(self):
         """
         Salva le impostazioni dell'applicazione
         """
-        settings = {
-            'last_directory': self.dir_var.get(),
-            'pattern': self.pattern_var.get(),
-            'recursive': self.recursive_var.get(),
-            'rename_type': self.rename_type.get(),
-            'dry_run': self.dry_run_var.get(),
-            'backup': self.backup_var.get(),
-            'log_format': self.log_format_var.get()
-        }
-        
-        # Aggiunge le impostazioni specifiche per tipo
-        if hasattr(self, 'base_name_var'):
-            settings['base_name'] = self.base_name_var.get()
-        if hasattr(self, 'start_number_var'):
-            settings['start_number'] = self.start_number_var.get()
-        if hasattr(self, 'custom_pattern_var'):
-            settings['custom_pattern'] = self.custom_pattern_var.get()
-        if hasattr(self, 'case_type_var'):
-            settings['case_type'] = self.case_type_var.get()
-        if hasattr(self, 'regex_pattern_var'):
-            settings['regex_pattern'] = self.regex_pattern_var.get()
-        if hasattr(self, 'regex_replace_var'):
-            settings['regex_replace'] = self.regex_replace_var.get()
+        settings = {key: var.get() for key, var in self._vars.items()}
+        
+        # Niente da scrivere se il file contiene già queste impostazioni
+        if settings == self._saved_settings:
+            return
         
         try:
-            with open('gui_settings.json', 'w') as f:
-                json.dump(settings, f, indent=2)
+            # Il file viene letto solo dal programma: niente indentazione,
+            # così anche json usa l'encoder compatto in C
+            if orjson is not None:
+                data = orjson.dumps(settings)
+            else:
+                data = json.dumps(settings, separators=(',', ':')).encode('utf-8')
+            
+            # Scrive su un file temporaneo e lo sostituisce con un rename
+            # atomico: un'interruzione non lascia il file troncato
+            with open('gui_settings.json.tmp', 'wb') as f:
+                f.write(data)
+            os.replace('gui_settings.json.tmp', 'gui_settings.json')
+            self._saved_settings = settings
         except Exception as e:
             self.log_message(f"Errore salvando le impostazioni: {str(e)}", "ERROR")
     
@@ -833,27 +1363,22 @@ class FileRenamerGUI:
         Carica le impostazioni salvate
         """
         try:
-            if os.path.exists('gui_settings.json'):
-                with open('gui_settings.json', 'r') as f:
-                    settings = json.load(f)
-                
-                # Ripristina le impostazioni base
-                if 'last_directory' in settings:
-                    self.dir_var.set(settings['last_directory'])
-                if 'pattern' in settings:
-                    self.pattern_var.set(settings['pattern'])
-                if 'recursive' in settings:
-                    self.recursive_var.set(settings['recursive'])
-                if 'rename_type' in settings:
-                    self.rename_type.set(settings['rename_type'])
-                if 'dry_run' in settings:
-                    self.dry_run_var.set(settings['dry_run'])
-                if 'backup' in settings:
-                    self.backup_var.set(settings['backup'])
-                if 'log_format' in settings:
-                    self.log_format_var.set(settings['log_format'])
-                
-                self.log_message("Impostazioni caricate")
+            with open('gui_settings.json', 'rb') as f:
+                data = f.read()
+            settings = orjson.loads(data) if orjson is not None else json.loads(data)
+            self._saved_settings = settings
+            
+            # Ripristina le impostazioni presenti nel file
+            for key, var in self._vars.items():
+                if key in settings:
+                    var.set(settings[key])
+            if 'rename_type' in settings:
+                self.on_rename_type_change()
+            
+            self.log_message("Impostazioni caricate")
+        except FileNotFoundError:
+            # Nessuna impostazione salvata
+            pass
         except Exception as e:
             self.log_message(f"Errore caricando le impostazioni: {str(e)}", "ERROR")
     
@@ -868,6 +1393,22 @@ class FileRenamerGUI:
         self.root.destroy()
 
 
+# Testo della finestra Informazioni
+_ABOUT_DESCRIPTION = """Un potente strumento per rinominare file in batch con interfaccia grafica intuitiva.
+
+Caratteristiche:
+• Rinomina sequenziale con numerazione automatica
+• Pattern personalizzati con placeholder
+• Trasformazioni di case (maiuscolo/minuscolo)
+• Supporto per espressioni regolari
+• Anteprima delle modifiche
+• Modalità test (dry run)
+• Backup automatico
+• Log dettagliato delle operazioni
+
+Sviluppato con Python e tkinter."""
+
+
 class AboutDialog:
     """
     Dialog per mostrare informazioni sull'applicazione
@@ -889,33 +1430,19 @@ class AboutDialog:
         
         # Titolo
         title = ttk.Label(content, text="🔄 Advanced File Renamer", 
-                         font=('Helvetica', 16, 'bold'))
+                         font='AboutTitle')
         title.pack(pady=(0, 10))
         
         # Versione
         version = ttk.Label(content, text="Versione 1.0.0", 
-                           font=('Helvetica', 10))
+                           font='AboutVersion')
         version.pack(pady=(0, 10))
         
         # Descrizione
         description = tk.Text(content, height=8, width=50, wrap=tk.WORD)
         description.pack(pady=(0, 10))
         
-        desc_text = """Un potente strumento per rinominare file in batch con interfaccia grafica intuitiva.
-
-Caratteristiche:
-• Rinomina sequenziale con numerazione automatica
-• Pattern personalizzati con placeholder
-• Trasformazioni di case (maiuscolo/minuscolo)
-• Supporto per espressioni regolari
-• Anteprima delle modifiche
-• Modalità test (dry run)
-• Backup automatico
-• Log dettagliato delle operazioni
-
-Sviluppato con Python e tkinter."""
-        
-        description.insert(1.0, desc_text)
+        description.insert(1.0, _ABOUT_DESCRIPTION)
         description.config(state='disabled')
         
         # Bottone chiudi